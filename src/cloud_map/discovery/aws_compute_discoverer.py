@@ -1,20 +1,34 @@
 """AWS compute resource discovery implementation."""
 
-from typing import List, Optional
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from .interfaces import ComputeDiscoverer
 from ..model.models import EC2Instance
 from .boto3_caller import Boto3Caller
+from .tags import tags_from_list
+from .response_cache import ResponseCache, INSTANCE_CACHE_TTL
+
+# Keys describe_instances always returns; network fields are absent on
+# terminated instances, so those keep their .get() defaults
+_get_required_fields = itemgetter('InstanceId', 'InstanceType', 'State')
 
 
 class AWSComputeDiscoverer(ComputeDiscoverer):
     """AWS implementation of compute resource discovery."""
     
-    def __init__(self, region: str = 'us-east-1', session: Optional[boto3.Session] = None):
+    def __init__(
+        self,
+        region: str = 'us-east-1',
+        session: Optional[boto3.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        boto3_caller: Optional[Boto3Caller] = None
+    ):
         self.region = region
-        self.boto3_caller = Boto3Caller(region, session)
+        self.boto3_caller = boto3_caller or Boto3Caller(region, session, cache)
     
     def discover_ec2_instances(self, subnet_id: Optional[str] = None) -> List[EC2Instance]:
         """Discover EC2 instances, optionally filtered by subnet."""
@@ -23,37 +37,56 @@ class AWSComputeDiscoverer(ComputeDiscoverer):
             if subnet_id:
                 filters.append({'Name': 'subnet-id', 'Values': [subnet_id]})
             
-            if filters:
-                response = self.boto3_caller.call_api('ec2', 'describe_instances', Filters=filters)
-            else:
-                response = self.boto3_caller.call_api('ec2', 'describe_instances')
+            return list(self._iter_instances(filters))
             
-            instances = []
+        except (BotoCoreError, ClientError) as e:
+            raise RuntimeError(f"Failed to discover EC2 instances: {e}")
+    
+    def discover_ec2_instances_for_subnets(self, subnet_ids: List[str]) -> Dict[str, List[EC2Instance]]:
+        """Discover EC2 instances for several subnets, grouped by subnet ID."""
+        try:
+            instances_by_subnet: Dict[str, List[EC2Instance]] = {subnet_id: [] for subnet_id in subnet_ids}
             
-            for reservation in response['Reservations']:
-                for instance_data in reservation['Instances']:
-                    tags = {tag['Key']: tag['Value'] for tag in instance_data.get('Tags', [])}
-                    
-                    security_groups = [
-                        sg['GroupId'] for sg in instance_data.get('SecurityGroups', [])
-                    ]
-                    
-                    instance = EC2Instance(
-                        resource_id=instance_data['InstanceId'],
-                        resource_type='ec2_instance',
-                        region=self.region,
-                        tags=tags,
-                        instance_type=instance_data['InstanceType'],
-                        state=instance_data['State']['Name'],
-                        vpc_id=instance_data.get('VpcId', ''),
-                        subnet_id=instance_data.get('SubnetId', ''),
-                        private_ip=instance_data.get('PrivateIpAddress', ''),
-                        public_ip=instance_data.get('PublicIpAddress'),
-                        security_groups=security_groups
-                    )
-                    instances.append(instance)
+            # EC2 accepts at most 200 values per filter
+            for i in range(0, len(subnet_ids), 200):
+                filters = [{'Name': 'subnet-id', 'Values': subnet_ids[i:i + 200]}]
+                for instance in self._iter_instances(filters):
+                    instances_by_subnet[instance.subnet_id].append(instance)
             
-            return instances
+            return instances_by_subnet
             
         except (BotoCoreError, ClientError) as e:
-            raise RuntimeError(f"Failed to discover EC2 instances: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to discover EC2 instances for subnets {', '.join(subnet_ids)}: {e}")
+    
+    def _iter_instances(self, filters: List[Dict[str, Any]]) -> Iterator[EC2Instance]:
+        """Run a paginated describe_instances call and yield the instance models.
+        
+        Only the fields the model needs are copied out, so each raw page can
+        be freed once its instances have been yielded.
+        """
+        params = {'Filters': filters} if filters else {}
+        region = self.region
+        
+        for page in self.boto3_caller.paginate(
+            'ec2', 'describe_instances', page_size=1000, cache_ttl=INSTANCE_CACHE_TTL, **params
+        ):
+            for instance_data in chain.from_iterable(
+                reservation['Instances'] for reservation in page['Reservations']
+            ):
+                instance_id, instance_type, state = _get_required_fields(instance_data)
+                get = instance_data.get
+                
+                security_groups = [sg['GroupId'] for sg in get('SecurityGroups', [])]
+                
+                yield EC2Instance(
+                    resource_id=instance_id,
+                    region=region,
+                    tags=tags_from_list(get('Tags')),
+                    instance_type=instance_type,
+                    state=state['Name'],
+                    vpc_id=get('VpcId', ''),
+                    subnet_id=get('SubnetId', ''),
+                    private_ip=get('PrivateIpAddress', ''),
+                    public_ip=get('PublicIpAddress'),
+                    security_groups=security_groups
+                )
\ No newline at end of file
@@ -7,14 +7,20 @@ from botocore.exceptions import BotoCoreError, ClientError
 from .interfaces import DatabaseDiscoverer
 from ..model.models import RDSInstance, ElastiCacheCluster, ElastiCacheReplicationGroup, MSKCluster, RDSNode, ElastiCacheNode, MSKBrokerNode
 from .boto3_caller import Boto3Caller
+from .tags import EMPTY_TAGS, tags_from_dict, tags_from_list
 
 
 class AWSDatabaseDiscoverer(DatabaseDiscoverer):
     """AWS implementation of database resource discovery."""
     
-    def __init__(self, region: str = 'us-east-1', session: Optional[boto3.Session] = None):
+    def __init__(
+        self,
+        region: str = 'us-east-1',
+        session: Optional[boto3.Session] = None,
+        boto3_caller: Optional[Boto3Caller] = None
+    ):
         self.region = region
-        self.boto3_caller = Boto3Caller(region, session)
+        self.boto3_caller = boto3_caller or Boto3Caller(region, session)
     
     def discover_rds_instances(self, vpc_id: Optional[str] = None) -> List[RDSInstance]:
         """Discover RDS database instances, optionally filtered by VPC."""
@@ -35,13 +41,12 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                     'list_tags_for_resource',
                     ResourceName=db_instance_data['DBInstanceArn']
                 )
-                tags = {tag['Key']: tag['Value'] for tag in tags_response.get('TagList', [])}
+                tags = tags_from_list(tags_response.get('TagList'))
                 
                 endpoint_data = db_instance_data.get('Endpoint', {})
                 
                 instance = RDSInstance(
                     resource_id=db_instance_data['DBInstanceIdentifier'],
-                    resource_type='rds_instance',
                     region=self.region,
                     tags=tags,
                     db_instance_identifier=db_instance_data['DBInstanceIdentifier'],
@@ -104,9 +109,9 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                         'list_tags_for_resource',
                         ResourceName=cluster_data['ARN']
                     )
-                    tags = {tag['Key']: tag['Value'] for tag in tags_response.get('TagList', [])}
+                    tags = tags_from_list(tags_response.get('TagList'))
                 except (BotoCoreError, ClientError):
-                    tags = {}
+                    tags = EMPTY_TAGS
                 
                 security_group_ids = [
                     sg['SecurityGroupId'] for sg in cluster_data.get('SecurityGroups', [])
@@ -123,7 +128,6 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                 
                 cluster = ElastiCacheCluster(
                     resource_id=cluster_data['CacheClusterId'],
-                    resource_type='elasticache_cluster',
                     region=self.region,
                     tags=tags,
                     cache_cluster_id=cluster_data['CacheClusterId'],
@@ -190,9 +194,9 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                         'list_tags_for_resource',
                         ResourceName=rg_data['ARN']
                     )
-                    tags = {tag['Key']: tag['Value'] for tag in tags_response.get('TagList', [])}
+                    tags = tags_from_list(tags_response.get('TagList'))
                 except (BotoCoreError, ClientError):
-                    tags = {}
+                    tags = EMPTY_TAGS
                 
                 security_group_ids = [
                     sg['SecurityGroupId'] for sg in rg_data.get('GlobalReplicationGroupInfo', {}).get('GlobalReplicationGroupMemberRole', {}).get('SecurityGroups', [])
@@ -222,7 +226,6 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                 
                 replication_group = ElastiCacheReplicationGroup(
                     resource_id=rg_data['ReplicationGroupId'],
-                    resource_type='elasticache_replication_group',
                     region=self.region,
                     tags=tags,
                     replication_group_id=rg_data['ReplicationGroupId'],
@@ -294,9 +297,9 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                         'list_tags_for_resource',
                         ResourceArn=cluster_arn
                     )
-                    tags = tags_response.get('Tags', {})
+                    tags = tags_from_dict(tags_response.get('Tags'))
                 except (BotoCoreError, ClientError):
-                    tags = {}
+                    tags = EMPTY_TAGS
                 
                 # Get broker node information
                 broker_nodes = []
@@ -310,7 +313,6 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                     for node_info in nodes_response.get('NodeInfoList', []):
                         broker_node = MSKBrokerNode(
                             resource_id=f"{cluster_data['ClusterName']}-broker-{node_info.get('BrokerNodeInfo', {}).get('BrokerId', '')}",
-                            resource_type='msk_broker_node',
                             region=self.region,
                             tags=tags,
                             broker_id=str(node_info.get('BrokerNodeInfo', {}).get('BrokerId', '')),
@@ -332,7 +334,6 @@ class AWSDatabaseDiscoverer(DatabaseDiscoverer):
                 
                 cluster = MSKCluster(
                     resource_id=cluster_data['ClusterName'],
-                    resource_type='msk_cluster',
                     region=self.region,
                     tags=tags,
                     cluster_name=cluster_data['ClusterName'],
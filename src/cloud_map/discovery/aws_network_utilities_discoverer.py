@@ -1,128 +1,154 @@
 """AWS network utilities discovery implementation."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from ..model.models import Route53HostedZone, APIGateway
 from .boto3_caller import Boto3Caller
+from .tags import EMPTY_TAGS, tags_from_dict, tags_from_list
 from .interfaces import NetworkUtilitiesDiscoverer
 
 
 class AWSNetworkUtilitiesDiscoverer(NetworkUtilitiesDiscoverer):
     """AWS implementation of network utilities discovery."""
     
-    def __init__(self, region: str = 'us-east-1', session: Optional[boto3.Session] = None):
+    def __init__(
+        self,
+        region: str = 'us-east-1',
+        session: Optional[boto3.Session] = None,
+        boto3_caller: Optional[Boto3Caller] = None
+    ):
         self.region = region
-        self.boto3_caller = Boto3Caller(region, session)
+        self.boto3_caller = boto3_caller or Boto3Caller(region, session)
     
     def discover_route53_zones(self, vpc_id: Optional[str] = None) -> List[Route53HostedZone]:
         """Discover Route53 hosted zones, optionally filtered by VPC."""
         try:
-            response = self.boto3_caller.call_api('route53', 'list_hosted_zones')
-            zones = []
+            zone_ids = [
+                zone_data['Id'].split('/')[-1]
+                for page in self.boto3_caller.paginate('route53', 'list_hosted_zones')
+                for zone_data in page['HostedZones']
+            ]
             
-            for zone_data in response['HostedZones']:
-                zone_id = zone_data['Id'].split('/')[-1]
+            # Zone details have no batch API. Route53 is global and allows 5
+            # requests per second per account, so fetch them sequentially and
+            # let the client's adaptive retries absorb any throttling.
+            matched_zones = []
+            for zone_id in zone_ids:
+                zone_details = self._get_hosted_zone_details(zone_id)
+                if zone_details is None:
+                    continue
                 
-                try:
-                    zone_details = self.boto3_caller.call_api('route53', 'get_hosted_zone', Id=zone_id)
-                    zone_info = zone_details['HostedZone']
-                    vpcs = zone_details.get('VPCs', [])
-                    
-                    vpc_associations = [vpc['VPCId'] for vpc in vpcs]
-                    
-                    if vpc_id and vpc_id not in vpc_associations:
-                        continue
-                    
-                    try:
-                        tags_response = self.boto3_caller.call_api(
-                            'route53', 'list_tags_for_resource',
-                            ResourceType='hostedzone',
-                            ResourceId=zone_id
-                        )
-                        tags = {tag['Key']: tag['Value'] for tag in tags_response.get('ResourceTagSet', {}).get('Tags', [])}
-                    except (BotoCoreError, ClientError):
-                        tags = {}
-                    
-                    zone = Route53HostedZone(
-                        resource_id=zone_id,
-                        resource_type='route53_hosted_zone',
-                        region=self.region,
-                        tags=tags,
-                        zone_name=zone_info['Name'],
-                        zone_id=zone_id,
-                        private_zone=zone_info.get('Config', {}).get('PrivateZone', False),
-                        record_count=zone_info.get('ResourceRecordSetCount', 0),
-                        vpc_associations=vpc_associations
-                    )
-                    zones.append(zone)
-                    
-                except (BotoCoreError, ClientError) as e:
-                    print(f"Warning: Failed to get details for hosted zone {zone_id}: {e}")
+                vpc_associations = [vpc['VPCId'] for vpc in zone_details.get('VPCs', [])]
+                
+                if vpc_id and vpc_id not in vpc_associations:
                     continue
+                
+                matched_zones.append((zone_id, zone_details['HostedZone'], vpc_associations))
+            
+            zone_tags = self._get_hosted_zone_tags([zone_id for zone_id, _, _ in matched_zones])
+            
+            zones = []
+            for zone_id, zone_info, vpc_associations in matched_zones:
+                zone = Route53HostedZone(
+                    resource_id=zone_id,
+                    region=self.region,
+                    tags=zone_tags.get(zone_id, EMPTY_TAGS),
+                    zone_name=zone_info['Name'],
+                    zone_id=zone_id,
+                    private_zone=zone_info.get('Config', {}).get('PrivateZone', False),
+                    record_count=zone_info.get('ResourceRecordSetCount', 0),
+                    vpc_associations=vpc_associations
+                )
+                zones.append(zone)
             
             return zones
             
         except (BotoCoreError, ClientError) as e:
             raise RuntimeError(f"Failed to discover Route53 hosted zones: {e}")
     
+    def _get_hosted_zone_details(self, zone_id: str) -> Optional[Dict[str, Any]]:
+        """Get hosted zone details, or None if the lookup fails."""
+        try:
+            return self.boto3_caller.call_api('route53', 'get_hosted_zone', Id=zone_id)
+        except (BotoCoreError, ClientError) as e:
+            print(f"Warning: Failed to get details for hosted zone {zone_id}: {e}")
+            return None
+    
+    def _get_hosted_zone_tags(self, zone_ids: List[str]) -> Dict[str, Mapping[str, str]]:
+        """Get tags for hosted zones, batched up to 10 zones per request."""
+        zone_tags = {}
+        
+        for i in range(0, len(zone_ids), 10):
+            try:
+                tags_response = self.boto3_caller.call_api(
+                    'route53', 'list_tags_for_resources',
+                    ResourceType='hostedzone',
+                    ResourceIds=zone_ids[i:i + 10]
+                )
+            except (BotoCoreError, ClientError):
+                continue
+            
+            for tag_set in tags_response.get('ResourceTagSets', []):
+                zone_tags[tag_set['ResourceId']] = tags_from_list(tag_set.get('Tags'))
+        
+        return zone_tags
+    
     def discover_api_gateways(self, vpc_id: Optional[str] = None) -> List[APIGateway]:
         """Discover API Gateways, optionally filtered by VPC."""
         gateways = []
         
         try:
-            rest_apis = self.boto3_caller.call_api('apigateway', 'get_rest_apis')
-            for api_data in rest_apis['items']:
-                try:
-                    tags_response = self.boto3_caller.call_api(
-                        'apigateway', 'get_tags',
-                        resourceArn=f"arn:aws:apigateway:{self.region}::/restapis/{api_data['id']}"
+            for page in self.boto3_caller.paginate('apigateway', 'get_rest_apis'):
+                for api_data in page['items']:
+                    try:
+                        tags_response = self.boto3_caller.call_api(
+                            'apigateway', 'get_tags',
+                            resourceArn=f"arn:aws:apigateway:{self.region}::/restapis/{api_data['id']}"
+                        )
+                        tags = tags_from_dict(tags_response.get('tags'))
+                    except (BotoCoreError, ClientError):
+                        tags = EMPTY_TAGS
+                    
+                    gateway = APIGateway(
+                        resource_id=api_data['id'],
+                        region=self.region,
+                        tags=tags,
+                        api_name=api_data.get('name', ''),
+                        api_type='REST',
+                        protocol_type='HTTP',
+                        endpoint_type=api_data.get('endpointConfiguration', {}).get('types', ['EDGE'])[0],
+                        vpc_links=[]
                     )
-                    tags = tags_response.get('tags', {})
-                except (BotoCoreError, ClientError):
-                    tags = {}
-                
-                gateway = APIGateway(
-                    resource_id=api_data['id'],
-                    resource_type='api_gateway',
-                    region=self.region,
-                    tags=tags,
-                    api_name=api_data.get('name', ''),
-                    api_type='REST',
-                    protocol_type='HTTP',
-                    endpoint_type=api_data.get('endpointConfiguration', {}).get('types', ['EDGE'])[0],
-                    vpc_links=[]
-                )
-                gateways.append(gateway)
+                    gateways.append(gateway)
                 
         except (BotoCoreError, ClientError) as e:
             print(f"Warning: Failed to discover REST APIs: {e}")
         
         try:
-            http_apis = self.boto3_caller.call_api('apigatewayv2', 'get_apis')
-            for api_data in http_apis['Items']:
-                try:
-                    tags_response = self.boto3_caller.call_api(
-                        'apigatewayv2', 'get_tags',
-                        ResourceArn=f"arn:aws:apigateway:{self.region}::/apis/{api_data['ApiId']}"
+            for page in self.boto3_caller.paginate('apigatewayv2', 'get_apis'):
+                for api_data in page['Items']:
+                    try:
+                        tags_response = self.boto3_caller.call_api(
+                            'apigatewayv2', 'get_tags',
+                            ResourceArn=f"arn:aws:apigateway:{self.region}::/apis/{api_data['ApiId']}"
+                        )
+                        tags = tags_from_dict(tags_response.get('Tags'))
+                    except (BotoCoreError, ClientError):
+                        tags = EMPTY_TAGS
+                    
+                    gateway = APIGateway(
+                        resource_id=api_data['ApiId'],
+                        region=self.region,
+                        tags=tags,
+                        api_name=api_data.get('Name', ''),
+                        api_type='HTTP',
+                        protocol_type=api_data.get('ProtocolType', 'HTTP'),
+                        endpoint_type='REGIONAL',
+                        vpc_links=[]
                     )
-                    tags = tags_response.get('Tags', {})
-                except (BotoCoreError, ClientError):
-                    tags = {}
-                
-                gateway = APIGateway(
-                    resource_id=api_data['ApiId'],
-                    resource_type='api_gateway',
-                    region=self.region,
-                    tags=tags,
-                    api_name=api_data.get('Name', ''),
-                    api_type='HTTP',
-                    protocol_type=api_data.get('ProtocolType', 'HTTP'),
-                    endpoint_type='REGIONAL',
-                    vpc_links=[]
-                )
-                gateways.append(gateway)
+                    gateways.append(gateway)
                 
         except (BotoCoreError, ClientError) as e:
             print(f"Warning: Failed to discover HTTP APIs: {e}")
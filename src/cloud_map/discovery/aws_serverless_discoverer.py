@@ -6,15 +6,21 @@ from botocore.exceptions import BotoCoreError, ClientError
 
 from ..model.models import LambdaFunction
 from .boto3_caller import Boto3Caller
+from .tags import tags_from_dict
 from .interfaces import ServerlessDiscoverer
 
 
 class AWSServerlessDiscoverer(ServerlessDiscoverer):
     """AWS implementation of serverless resource discovery."""
     
-    def __init__(self, region: str = 'us-east-1', session: Optional[boto3.Session] = None):
+    def __init__(
+        self,
+        region: str = 'us-east-1',
+        session: Optional[boto3.Session] = None,
+        boto3_caller: Optional[Boto3Caller] = None
+    ):
         self.region = region
-        self.boto3_caller = Boto3Caller(region, session)
+        self.boto3_caller = boto3_caller or Boto3Caller(region, session)
     
     def discover_lambda_functions(self, vpc_id: Optional[str] = None) -> List[LambdaFunction]:
         """Discover Lambda functions, optionally filtered by VPC."""
@@ -42,11 +48,10 @@ class AWSServerlessDiscoverer(ServerlessDiscoverer):
                         'lambda', 'list_tags',
                         Resource=func_config['FunctionArn']
                     )
-                    tags = tags_response.get('Tags', {})
+                    tags = tags_from_dict(tags_response.get('Tags'))
                     
                     lambda_func = LambdaFunction(
                         resource_id=func_config['FunctionArn'],
-                        resource_type='lambda_function',
                         region=self.region,
                         tags=tags,
                         function_name=function_name,
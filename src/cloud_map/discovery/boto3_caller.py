@@ -1,28 +1,96 @@
 """Boto3 API caller with logging abstraction."""
 
 import logging
-from typing import Any, Dict, Optional
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional
 import boto3
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from .response_cache import ResponseCache
+
+# boto3 sessions are not thread-safe, so client creation is serialized
+# across every caller sharing a session. The clients themselves are
+# thread-safe and shared by all discovery threads.
+_client_creation_lock = threading.Lock()
+
+
+def _max_pool_connections() -> int:
+    """Connection pool size per shared client, overridable via CLOUD_MAP_MAX_POOL_CONNECTIONS.
+    
+    The default stays above the executor's worker count so concurrent
+    calls through one client never wait on a free connection.
+    """
+    override = os.environ.get('CLOUD_MAP_MAX_POOL_CONNECTIONS')
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                f"Ignoring invalid CLOUD_MAP_MAX_POOL_CONNECTIONS value: {override}"
+            )
+    return max(32, (os.cpu_count() or 1) * 4)
+
+
+# Adaptive retries absorb throttling once discovery calls run concurrently,
+# and keepalive stops idle pooled connections from being dropped mid-run.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=_max_pool_connections(),
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True
+)
+
 
 class Boto3Caller:
     """Abstraction layer for boto3 API calls with logging."""
     
-    def __init__(self, region: str, session: Optional[boto3.Session] = None):
+    def __init__(
+        self,
+        region: str,
+        session: Optional[boto3.Session] = None,
+        cache: Optional[ResponseCache] = None
+    ):
         self.region = region
         self.session = session or boto3.Session()
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
         self._clients: Dict[str, Any] = {}
+        self._account_id: Optional[str] = None
+        self._account_id_lock = threading.Lock()
     
     def get_client(self, service_name: str):
-        """Get a boto3 client for the specified service."""
-        if service_name not in self._clients:
-            self._clients[service_name] = self.session.client(
-                service_name, 
-                region_name=self.region
-            )
-        return self._clients[service_name]
+        """Get the boto3 client for the specified service, shared across threads.
+        
+        Sharing one client per service also lets adaptive retries rate-limit
+        every call to that service from a single throttling state.
+        """
+        client = self._clients.get(service_name)
+        if client is None:
+            with _client_creation_lock:
+                client = self._clients.get(service_name)
+                if client is None:
+                    client = self._clients[service_name] = self.session.client(
+                        service_name, 
+                        region_name=self.region,
+                        config=_CLIENT_CONFIG
+                    )
+        return client
+    
+    def _get_account_id(self) -> Optional[str]:
+        """Account ID of the session's credentials, fetched once to scope cache keys.
+        
+        Returns None when the identity cannot be resolved, in which case the
+        response cache is bypassed rather than risk serving another account's data.
+        """
+        with self._account_id_lock:
+            if self._account_id is None:
+                try:
+                    self._account_id = self.call_api('sts', 'get_caller_identity')['Account']
+                except (BotoCoreError, ClientError) as e:
+                    self.logger.warning(f"Bypassing response cache, caller identity unavailable: {e}")
+                    self._account_id = ''
+            return self._account_id or None
     
     def call_api(self, service: str, operation: str, **kwargs) -> Dict[str, Any]:
         """Make a boto3 API call with logging."""
@@ -39,4 +107,54 @@ class Boto3Caller:
             return response
         except (BotoCoreError, ClientError) as e:
             self.logger.error(f"Error calling {service}.{operation}: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def paginate(
+        self,
+        service: str,
+        operation: str,
+        page_size: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over every page of a paginated boto3 API call with logging.
+        
+        When the caller has a response cache and cache_ttl is given, pages
+        younger than cache_ttl seconds are served from disk instead.
+        """
+        cache = self.cache
+        cache_key = None
+        if cache is not None and cache_ttl:
+            account_id = self._get_account_id()
+            if account_id:
+                cache_key = cache.make_key(account_id, self.region, service, operation, kwargs)
+                cached_pages = cache.get(cache_key, cache_ttl)
+                if cached_pages is not None:
+                    self.logger.info(f"Serving {service}.{operation} in region {self.region} from cache")
+                    yield from cached_pages
+                    return
+        
+        client = self.get_client(service)
+        paginator = client.get_paginator(operation)
+        
+        params = dict(kwargs)
+        if page_size:
+            params['PaginationConfig'] = {'PageSize': page_size}
+        
+        self.logger.info(
+            f"Paginating {service}.{operation} in region {self.region} with params: {params}"
+        )
+        
+        pages = []
+        try:
+            for page in paginator.paginate(**params):
+                if cache_key:
+                    pages.append(page)
+                yield page
+            self.logger.info(f"Successfully paginated {service}.{operation}")
+        except (BotoCoreError, ClientError) as e:
+            self.logger.error(f"Error paginating {service}.{operation}: {e}")
+            raise
+        
+        if cache is not None and cache_key:
+            cache.set(cache_key, pages)
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Interfaces and protocols for cloud map components."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..model.models import VPC, Subnet, RouteTable, InternetGateway, EC2Instance, LambdaFunction, Route53HostedZone, APIGateway, NATGateway, NetworkACL, SecurityGroup, RDSInstance, ElastiCacheCluster, ElastiCacheReplicationGroup, MSKCluster, RDSNode, ElastiCacheNode, MSKBrokerNode
 
@@ -19,30 +19,54 @@ class NetworkDiscoverer(ABC):
         """Discover subnets for a given VPC."""
         pass
     
+    def discover_subnets_for_vpcs(self, vpc_ids: List[str]) -> List[Subnet]:
+        """Discover subnets for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_subnets(vpc_id)]
+    
     @abstractmethod
     def discover_route_tables(self, vpc_id: str) -> List[RouteTable]:
         """Discover route tables for a given VPC."""
         pass
     
+    def discover_route_tables_for_vpcs(self, vpc_ids: List[str]) -> List[RouteTable]:
+        """Discover route tables for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_route_tables(vpc_id)]
+    
     @abstractmethod
     def discover_internet_gateways(self, vpc_id: str) -> List[InternetGateway]:
         """Discover internet gateways for a given VPC."""
         pass
     
+    def discover_internet_gateways_for_vpcs(self, vpc_ids: List[str]) -> List[InternetGateway]:
+        """Discover internet gateways for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_internet_gateways(vpc_id)]
+    
     @abstractmethod
     def discover_nat_gateways(self, vpc_id: str) -> List[NATGateway]:
         """Discover NAT gateways for a given VPC."""
         pass
     
+    def discover_nat_gateways_for_vpcs(self, vpc_ids: List[str]) -> List[NATGateway]:
+        """Discover NAT gateways for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_nat_gateways(vpc_id)]
+    
     @abstractmethod
     def discover_network_acls(self, vpc_id: str) -> List[NetworkACL]:
         """Discover Network ACLs for a given VPC."""
         pass
     
+    def discover_network_acls_for_vpcs(self, vpc_ids: List[str]) -> List[NetworkACL]:
+        """Discover Network ACLs for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_network_acls(vpc_id)]
+    
     @abstractmethod
     def discover_security_groups(self, vpc_id: str) -> List[SecurityGroup]:
         """Discover Security Groups for a given VPC."""
         pass
+    
+    def discover_security_groups_for_vpcs(self, vpc_ids: List[str]) -> List[SecurityGroup]:
+        """Discover Security Groups for several VPCs; override to batch the lookups."""
+        return [resource for vpc_id in vpc_ids for resource in self.discover_security_groups(vpc_id)]
 
 
 class ComputeDiscoverer(ABC):
@@ -52,6 +76,10 @@ class ComputeDiscoverer(ABC):
     def discover_ec2_instances(self, subnet_id: Optional[str] = None) -> List[EC2Instance]:
         """Discover EC2 instances, optionally filtered by subnet."""
         pass
+    
+    def discover_ec2_instances_for_subnets(self, subnet_ids: List[str]) -> Dict[str, List[EC2Instance]]:
+        """Discover EC2 instances for several subnets grouped by subnet ID; override to batch the lookups."""
+        return {subnet_id: self.discover_ec2_instances(subnet_id) for subnet_id in subnet_ids}
 
 
 class ServerlessDiscoverer(ABC):
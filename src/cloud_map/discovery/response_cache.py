@@ -0,0 +1,87 @@
+"""On-disk TTL cache for raw boto3 API responses."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Layered TTLs in seconds: network layout changes rarely, instance state often
+NETWORK_CACHE_TTL = 3600
+ROUTING_CACHE_TTL = 600
+INSTANCE_CACHE_TTL = 60
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'cloud-map'
+
+
+def _dumps(pages: List[Dict[str, Any]]) -> bytes:
+    """Serialize pages, using orjson when it is installed."""
+    if _HAS_ORJSON:
+        # Pass datetimes through to str() so entries match the stdlib encoding
+        return orjson.dumps(
+            pages,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(pages, default=str).encode('utf-8')
+
+
+def _loads(data: bytes) -> List[Dict[str, Any]]:
+    """Deserialize pages, using orjson when it is installed."""
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResponseCache:
+    """Filesystem cache of paginated boto3 responses keyed by (account, region, api, params)."""
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.logger = logging.getLogger(__name__)
+    
+    def make_key(self, account_id: str, region: str, service: str, operation: str, params: Dict[str, Any]) -> str:
+        """Build a stable cache key for an API call made with the given account's credentials."""
+        payload = json.dumps([account_id, region, service, operation, params], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(self, key: str, ttl: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached pages for a key, or None if missing or older than ttl."""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > ttl:
+                return None
+            with open(path, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, key: str, pages: List[Dict[str, Any]]) -> None:
+        """Store pages for a key, replacing any previous entry atomically."""
+        tmp_path = None
+        try:
+            # Serialize before touching disk; orjson's encode error subclasses TypeError
+            data = _dumps(pages)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            tmp_path = None
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Failed to write response cache entry {key}: {e}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
\ No newline at end of file
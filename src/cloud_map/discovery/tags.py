@@ -0,0 +1,22 @@
+"""Helpers for building resource tag mappings from AWS responses."""
+
+from sys import intern
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+# Shared by every untagged resource instead of a fresh dict per resource
+EMPTY_TAGS: Mapping[str, str] = MappingProxyType({})
+
+
+def tags_from_list(tag_list: Optional[List[Dict[str, str]]]) -> Mapping[str, str]:
+    """Build tags from a list of Key/Value pairs, interning the keys."""
+    if not tag_list:
+        return EMPTY_TAGS
+    return {intern(tag['Key']): tag['Value'] for tag in tag_list}
+
+
+def tags_from_dict(tag_dict: Optional[Dict[str, str]]) -> Mapping[str, str]:
+    """Build tags from a key to value dict, interning the keys."""
+    if not tag_dict:
+        return EMPTY_TAGS
+    return {intern(key): value for key, value in tag_dict.items()}
\ No newline at end of file
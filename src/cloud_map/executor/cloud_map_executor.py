@@ -1,8 +1,10 @@
 """Main executor for cloud map operations with multi-region and presentation support."""
 
 import sys
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 import boto3
 
 from ..discovery.aws_network_discoverer import AWSNetworkDiscoverer
@@ -10,26 +12,36 @@ from ..discovery.aws_compute_discoverer import AWSComputeDiscoverer
 from ..discovery.aws_serverless_discoverer import AWSServerlessDiscoverer
 from ..discovery.aws_network_utilities_discoverer import AWSNetworkUtilitiesDiscoverer
 from ..discovery.aws_database_discoverer import AWSDatabaseDiscoverer
+from ..discovery.boto3_caller import Boto3Caller
+from ..discovery.response_cache import ResponseCache
 from ..presentation.diagram import TextDiagramGenerator
-from ..presentation.plantuml_generator import PlantUMLDiagramGenerator
+from ..presentation.plantuml_generator import PLANTUML_FOOTER, PLANTUML_HEADER, PlantUMLDiagramGenerator
 from ..presentation.interfaces import DiagramGenerator
 from ..model.enums import PresentationType
 from .organizer import ResourceOrganizer
 from .output_manager import OutputManager
 
+T = TypeVar('T')
+
 
 class CloudMapExecutor:
     """Main executor for cloud infrastructure discovery and mapping with multi-region support."""
     
+    # Worker threads for discovery, which also bounds the in-flight AWS API
+    # calls to stay clear of request throttling
+    MAX_CONCURRENT_CALLS = 20
+    
     def __init__(
         self,
         regions: List[str] = None,
         session: Optional[boto3.Session] = None,
         presentation_type: PresentationType = PresentationType.TERMINAL,
-        command_args: Optional[Dict[str, Any]] = None
+        command_args: Optional[Dict[str, Any]] = None,
+        cache: Optional[ResponseCache] = None
     ):
         self.regions = regions or ['us-east-1']
         self.session = session or boto3.Session()
+        self.cache = cache
         self.presentation_type = presentation_type
         self.command_args = command_args or {}
         self.organizer = ResourceOrganizer()
@@ -60,74 +72,118 @@ class CloudMapExecutor:
     
     def discover_infrastructure(self, vpc_id: Optional[str] = None) -> Dict[str, Any]:
         """Discover infrastructure across all configured regions."""
-        all_topologies = {}
-        
-        for region in self.regions:
-            self.logger.info(f"Discovering infrastructure in region: {region}")
-            
-            try:
-                topology = self._discover_region_infrastructure(region, vpc_id)
-                all_topologies[region] = topology
-                self.logger.info(f"Successfully discovered infrastructure in {region}")
-            except Exception as e:
-                self.logger.error(f"Failed to discover infrastructure in {region}: {e}")
-                all_topologies[region] = None
+        return asyncio.run(self.discover_infrastructure_async(vpc_id))
+    
+    async def discover_infrastructure_async(self, vpc_id: Optional[str] = None) -> Dict[str, Any]:
+        """Discover infrastructure across all configured regions concurrently."""
+        with ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_CALLS,
+            thread_name_prefix='cloud-map-discovery'
+        ) as thread_pool:
+            topologies = await asyncio.gather(*(
+                self._discover_region_safely(region, vpc_id, thread_pool) for region in self.regions
+            ))
+        return dict(zip(self.regions, topologies))
+    
+    async def _discover_region_safely(self, region: str, vpc_id: Optional[str], thread_pool: ThreadPoolExecutor):
+        """Discover a region, logging failures instead of propagating them."""
+        self.logger.info(f"Discovering infrastructure in region: {region}")
         
-        return all_topologies
+        try:
+            topology = await self._discover_region_infrastructure(region, vpc_id, thread_pool)
+            self.logger.info(f"Successfully discovered infrastructure in {region}")
+            return topology
+        except Exception as e:
+            self.logger.error(f"Failed to discover infrastructure in {region}: {e}")
+            return None
+    
+    @staticmethod
+    async def _call(thread_pool: ThreadPoolExecutor, func: Callable[..., T], *args) -> T:
+        """Run a blocking discoverer call on the discovery thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(thread_pool, func, *args)
     
-    def _discover_region_infrastructure(self, region: str, vpc_id: Optional[str] = None):
+    async def _discover_region_infrastructure(
+        self,
+        region: str,
+        vpc_id: Optional[str],
+        thread_pool: ThreadPoolExecutor
+    ):
         """Discover infrastructure for a specific region."""
-        # Initialize discoverers for this region
-        network_discoverer = AWSNetworkDiscoverer(region, self.session)
-        compute_discoverer = AWSComputeDiscoverer(region, self.session)
-        serverless_discoverer = AWSServerlessDiscoverer(region, self.session)
-        utilities_discoverer = AWSNetworkUtilitiesDiscoverer(region, self.session)
-        database_discoverer = AWSDatabaseDiscoverer(region, self.session)
+        # Initialize discoverers for this region; they share one caller so
+        # each service client and its connection pool is created once
+        boto3_caller = Boto3Caller(region, self.session, self.cache)
+        network_discoverer = AWSNetworkDiscoverer(region, boto3_caller=boto3_caller)
+        compute_discoverer = AWSComputeDiscoverer(region, boto3_caller=boto3_caller)
+        serverless_discoverer = AWSServerlessDiscoverer(region, boto3_caller=boto3_caller)
+        utilities_discoverer = AWSNetworkUtilitiesDiscoverer(region, boto3_caller=boto3_caller)
+        database_discoverer = AWSDatabaseDiscoverer(region, boto3_caller=boto3_caller)
         
-        # Network discovery
-        vpcs = network_discoverer.discover_vpcs()
-        if vpc_id:
-            vpcs = [vpc for vpc in vpcs if vpc.resource_id == vpc_id]
-        
-        all_subnets = []
-        all_route_tables = []
-        all_gateways = []
-        all_nat_gateways = []
-        all_network_acls = []
-        all_security_groups = []
-        
-        for vpc in vpcs:
-            subnets = network_discoverer.discover_subnets(vpc.resource_id)
-            route_tables = network_discoverer.discover_route_tables(vpc.resource_id)
-            gateways = network_discoverer.discover_internet_gateways(vpc.resource_id)
-            nat_gateways = network_discoverer.discover_nat_gateways(vpc.resource_id)
-            network_acls = network_discoverer.discover_network_acls(vpc.resource_id)
-            security_groups = network_discoverer.discover_security_groups(vpc.resource_id)
+        async def discover_subnets_and_instances(vpc_ids):
+            """Discover subnets, then the EC2 instances in them when scoped to a VPC."""
+            subnets = await self._call(thread_pool, network_discoverer.discover_subnets_for_vpcs, vpc_ids)
+            if not vpc_id:
+                return subnets, None
             
-            all_subnets.extend(subnets)
-            all_route_tables.extend(route_tables)
-            all_gateways.extend(gateways)
-            all_nat_gateways.extend(nat_gateways)
-            all_network_acls.extend(network_acls)
-            all_security_groups.extend(security_groups)
+            # One subnet-filtered lookup replaces a region-wide scan
+            instances_by_subnet = await self._call(
+                thread_pool,
+                compute_discoverer.discover_ec2_instances_for_subnets,
+                [subnet.resource_id for subnet in subnets]
+            )
+            return subnets, [instance for instances in instances_by_subnet.values() for instance in instances]
         
-        # Compute discovery
-        ec2_instances = compute_discoverer.discover_ec2_instances()
-        if vpc_id:
-            ec2_instances = [inst for inst in ec2_instances if inst.vpc_id == vpc_id]
+        async def discover_network():
+            """Discover VPCs, then their network resources in batched lookups."""
+            vpcs = await self._call(thread_pool, network_discoverer.discover_vpcs)
+            if vpc_id:
+                vpcs = [vpc for vpc in vpcs if vpc.resource_id == vpc_id]
+            vpc_ids = [vpc.resource_id for vpc in vpcs]
+            
+            network_resources = await asyncio.gather(
+                discover_subnets_and_instances(vpc_ids),
+                self._call(thread_pool, network_discoverer.discover_route_tables_for_vpcs, vpc_ids),
+                self._call(thread_pool, network_discoverer.discover_internet_gateways_for_vpcs, vpc_ids),
+                self._call(thread_pool, network_discoverer.discover_nat_gateways_for_vpcs, vpc_ids),
+                self._call(thread_pool, network_discoverer.discover_network_acls_for_vpcs, vpc_ids),
+                self._call(thread_pool, network_discoverer.discover_security_groups_for_vpcs, vpc_ids)
+            )
+            (subnets, vpc_instances), *other_resources = network_resources
+            return vpcs, subnets, vpc_instances, *other_resources
         
-        # Serverless discovery
-        lambda_functions = serverless_discoverer.discover_lambda_functions(vpc_id)
+        async def discover_region_instances():
+            """Discover all EC2 instances in the region unless scoped to a VPC."""
+            if vpc_id:
+                return None
+            return await self._call(thread_pool, compute_discoverer.discover_ec2_instances)
         
-        # Network utilities discovery
-        route53_zones = utilities_discoverer.discover_route53_zones(vpc_id)
-        api_gateways = utilities_discoverer.discover_api_gateways(vpc_id)
+        # Network, compute, serverless, utilities and database discovery are
+        # independent of each other, so the API calls are fanned out together
+        (
+            network_resources,
+            ec2_instances,
+            lambda_functions,
+            route53_zones,
+            api_gateways,
+            rds_instances,
+            elasticache_clusters,
+            elasticache_replication_groups,
+            msk_clusters
+        ) = await asyncio.gather(
+            discover_network(),
+            discover_region_instances(),
+            self._call(thread_pool, serverless_discoverer.discover_lambda_functions, vpc_id),
+            self._call(thread_pool, utilities_discoverer.discover_route53_zones, vpc_id),
+            self._call(thread_pool, utilities_discoverer.discover_api_gateways, vpc_id),
+            self._call(thread_pool, database_discoverer.discover_rds_instances, vpc_id),
+            self._call(thread_pool, database_discoverer.discover_elasticache_clusters, vpc_id),
+            self._call(thread_pool, database_discoverer.discover_elasticache_replication_groups, vpc_id),
+            self._call(thread_pool, database_discoverer.discover_msk_clusters, vpc_id)
+        )
+        (vpcs, all_subnets, vpc_instances, all_route_tables, all_gateways,
+         all_nat_gateways, all_network_acls, all_security_groups) = network_resources
         
-        # Database discovery
-        rds_instances = database_discoverer.discover_rds_instances(vpc_id)
-        elasticache_clusters = database_discoverer.discover_elasticache_clusters(vpc_id)
-        elasticache_replication_groups = database_discoverer.discover_elasticache_replication_groups(vpc_id)
-        msk_clusters = database_discoverer.discover_msk_clusters(vpc_id)
+        if vpc_id:
+            ec2_instances = vpc_instances
         
         # Organization
         network_topologies = self.organizer.organize_network_topology(
@@ -215,31 +271,8 @@ class CloudMapExecutor:
     
     def _generate_consolidated_plantuml_content(self, topologies: Dict[str, Any]) -> str:
         """Generate consolidated PlantUML content for multiple regions."""
-        lines = []
-        lines.append("@startuml")
-        lines.append("!define AWSPuml https://raw.githubusercontent.com/awslabs/aws-icons-for-plantuml/v20.0/dist")
-        lines.append("!include AWSPuml/AWSCommon.puml")
-        lines.append("!include AWSPuml/AWSSimplified.puml")
-        lines.append("!include AWSPuml/Compute/EC2.puml")
-        lines.append("!include AWSPuml/Compute/EC2Instance.puml")
-        lines.append("!include AWSPuml/Compute/Lambda.puml")
-        lines.append("!include AWSPuml/NetworkingContentDelivery/VPCNATGateway.puml")
-        lines.append("!include AWSPuml/NetworkingContentDelivery/VPCInternetGateway.puml")
-        lines.append("!include AWSPuml/NetworkingContentDelivery/APIGateway.puml")
-        lines.append("!include AWSPuml/NetworkingContentDelivery/Route53.puml")
-        lines.append("!include AWSPuml/Database/RDS.puml")
-        lines.append("!include AWSPuml/Database/ElastiCache.puml")
-        lines.append("!include AWSPuml/Analytics/ManagedStreamingforApacheKafka.puml")
-        lines.append("!include AWSPuml/Groups/AWSCloud.puml")
-        lines.append("!include AWSPuml/Groups/VPC.puml")
-        lines.append("!include AWSPuml/Groups/PublicSubnet.puml")
-        lines.append("!include AWSPuml/Groups/PrivateSubnet.puml")
-        lines.append("!include AWSPuml/Groups/AvailabilityZone.puml")
-        lines.append("!include AWSPuml/Groups/Region.puml")
-        lines.append("")
-        lines.append("hide stereotype")
-        lines.append("skinparam linetype ortho")
-        lines.append("")
+        # The final join supplies the newline that ends the header
+        lines = [PLANTUML_HEADER.removesuffix("\n")]
         
         region_names = [region for region, topology in topologies.items() if topology is not None]
         lines.append(f"title AWS Multi-Region Infrastructure - {', '.join(region_names)}")
@@ -266,5 +299,5 @@ class CloudMapExecutor:
             lines.append("  }")
         
         lines.append("}")
-        lines.append("@enduml")
+        lines.append(PLANTUML_FOOTER)
         return "\n".join(lines)
\ No newline at end of file
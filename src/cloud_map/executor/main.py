@@ -4,6 +4,7 @@ import sys
 import argparse
 from typing import List, Optional
 
+from ..discovery.response_cache import ResponseCache
 from ..model.enums import PresentationType
 from .cloud_map_executor import CloudMapExecutor
 
@@ -38,6 +39,12 @@ def parse_args():
         help="Output file path (optional, defaults to stdout)"
     )
     
+    parser.add_argument(
+        "--cache",
+        action='store_true',
+        help="Reuse recent Describe* responses cached under ~/.cache/cloud-map"
+    )
+    
     return parser.parse_args()
 
 
@@ -57,14 +64,16 @@ def main():
         'regions': args.regions,
         'presentation': args.presentation,
         'vpc_id': args.vpc_id,
-        'output': args.output
+        'output': args.output,
+        'cache': args.cache
     }
     
     # Create and configure executor
     executor = CloudMapExecutor(
         regions=args.regions,
         presentation_type=presentation_type,
-        command_args=command_args
+        command_args=command_args,
+        cache=ResponseCache() if args.cache else None
     )
     
     try:
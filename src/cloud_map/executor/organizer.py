@@ -1,12 +1,24 @@
 """Organization layer for networks and computing resources."""
 
-from typing import List, Optional
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, List, Optional, Protocol, Tuple, TypeVar
 from dataclasses import dataclass, field
 
 from ..model.models import VPC, Subnet, RouteTable, InternetGateway, EC2Instance, LambdaFunction, Route53HostedZone, APIGateway, NATGateway, NetworkACL, SecurityGroup, RDSInstance, ElastiCacheCluster, ElastiCacheReplicationGroup, MSKCluster, RDSNode, ElastiCacheNode, MSKBrokerNode
 
 
-@dataclass
+class _HasVpcId(Protocol):
+    """Any resource model that records the VPC it belongs to."""
+    
+    @property
+    def vpc_id(self) -> Optional[str]: ...
+
+
+T = TypeVar('T', bound=_HasVpcId)
+
+
+@dataclass(slots=True)
 class NetworkTopology:
     """Organized network topology structure."""
     
@@ -26,17 +38,50 @@ class NetworkTopology:
     elasticache_replication_groups: List[ElastiCacheReplicationGroup] = field(default_factory=list)
     msk_clusters: List[MSKCluster] = field(default_factory=list)
     
+    # Lookup indexes built once from the resource lists above
+    _subnets_by_id: Dict[str, Subnet] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _instances_by_subnet: Dict[str, List[EC2Instance]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _nat_gateways_by_subnet: Dict[str, List[NATGateway]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    # Subnets partitioned by public IP mapping, overall and per Availability Zone
+    public_subnets: List[Subnet] = field(default_factory=list, init=False, repr=False, compare=False)
+    private_subnets: List[Subnet] = field(default_factory=list, init=False, repr=False, compare=False)
+    az_groups: Dict[str, Dict[str, List[Subnet]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._subnets_by_id = {subnet.resource_id: subnet for subnet in self.subnets}
+        for instance in self.ec2_instances:
+            self._instances_by_subnet.setdefault(instance.subnet_id, []).append(instance)
+        for nat in self.nat_gateways:
+            self._nat_gateways_by_subnet.setdefault(nat.subnet_id, []).append(nat)
+        
+        for subnet in self.subnets:
+            az = subnet.availability_zone
+            if az not in self.az_groups:
+                self.az_groups[az] = {'public': [], 'private': []}
+            
+            if subnet.map_public_ip_on_launch:
+                self.public_subnets.append(subnet)
+                self.az_groups[az]['public'].append(subnet)
+            else:
+                self.private_subnets.append(subnet)
+                self.az_groups[az]['private'].append(subnet)
+    
     def get_subnet_by_id(self, subnet_id: str) -> Optional[Subnet]:
         """Get subnet by ID."""
-        return next((subnet for subnet in self.subnets if subnet.resource_id == subnet_id), None)
+        return self._subnets_by_id.get(subnet_id)
     
     def get_instances_by_subnet(self, subnet_id: str) -> List[EC2Instance]:
         """Get EC2 instances in a specific subnet."""
-        return [instance for instance in self.ec2_instances if instance.subnet_id == subnet_id]
+        return self._instances_by_subnet.get(subnet_id, [])
+    
+    def get_nat_gateways_by_subnet(self, subnet_id: str) -> List[NATGateway]:
+        """Get NAT gateways placed in a specific subnet."""
+        return self._nat_gateways_by_subnet.get(subnet_id, [])
     
     def get_lambda_functions_by_subnet(self, subnet_id: str) -> List[LambdaFunction]:
         """Get Lambda functions in a specific subnet."""
-        return [func for func in self.lambda_functions if subnet_id in func.subnet_ids]
+        return [func for func in self.lambda_functions if subnet_id in func.subnet_id_set]
     
     def get_rds_nodes_by_subnet(self, subnet_id: str) -> List['RDSNode']:
         """Get individual RDS nodes in this specific subnet."""
@@ -102,37 +147,44 @@ class NetworkTopology:
     
     def get_public_subnets(self) -> List[Subnet]:
         """Get subnets that map public IPs on launch."""
-        return [subnet for subnet in self.subnets if subnet.map_public_ip_on_launch]
+        return self.public_subnets
     
     def get_private_subnets(self) -> List[Subnet]:
         """Get subnets that don't map public IPs on launch."""
-        return [subnet for subnet in self.subnets if not subnet.map_public_ip_on_launch]
+        return self.private_subnets
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountTopology:
     """Account-level topology organization."""
     
     region: str
     vpcs: List[NetworkTopology] = field(default_factory=list)
     
+    # Memoized flattened views across all VPCs; reset with invalidate()
+    _all_instances: Optional[Tuple[EC2Instance, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _all_subnets: Optional[Tuple[Subnet, ...]] = field(default=None, init=False, repr=False, compare=False)
+    
     def get_vpc_topology(self, vpc_id: str) -> Optional[NetworkTopology]:
         """Get VPC topology by VPC ID."""
         return next((vpc_topo for vpc_topo in self.vpcs if vpc_topo.vpc.resource_id == vpc_id), None)
     
-    def get_all_instances(self) -> List[EC2Instance]:
+    def get_all_instances(self) -> Tuple[EC2Instance, ...]:
         """Get all EC2 instances across all VPCs."""
-        instances = []
-        for vpc_topology in self.vpcs:
-            instances.extend(vpc_topology.ec2_instances)
-        return instances
+        if self._all_instances is None:
+            self._all_instances = tuple(chain.from_iterable(vpc_topology.ec2_instances for vpc_topology in self.vpcs))
+        return self._all_instances
     
-    def get_all_subnets(self) -> List[Subnet]:
+    def get_all_subnets(self) -> Tuple[Subnet, ...]:
         """Get all subnets across all VPCs."""
-        subnets = []
-        for vpc_topology in self.vpcs:
-            subnets.extend(vpc_topology.subnets)
-        return subnets
+        if self._all_subnets is None:
+            self._all_subnets = tuple(chain.from_iterable(vpc_topology.subnets for vpc_topology in self.vpcs))
+        return self._all_subnets
+    
+    def invalidate(self) -> None:
+        """Drop memoized views after the VPC topologies have been modified."""
+        self._all_instances = None
+        self._all_subnets = None
 
 
 class ResourceOrganizer:
@@ -167,48 +219,65 @@ class ResourceOrganizer:
         elasticache_replication_groups = elasticache_replication_groups or []
         msk_clusters = msk_clusters or []
         
+        # Bucket every collection by VPC in one pass instead of rescanning it per VPC
+        subnets_by_vpc = self._group_by_vpc(subnets)
+        route_tables_by_vpc = self._group_by_vpc(route_tables)
+        gateways_by_vpc = self._group_by_vpc(internet_gateways)
+        nat_gateways_by_vpc = self._group_by_vpc(nat_gateways)
+        network_acls_by_vpc = self._group_by_vpc(network_acls)
+        security_groups_by_vpc = self._group_by_vpc(security_groups)
+        instances_by_vpc = self._group_by_vpc(ec2_instances)
+        rds_instances_by_vpc = self._group_by_vpc(rds_instances)
+        elasticache_clusters_by_vpc = self._group_by_vpc(elasticache_clusters)
+        elasticache_replication_groups_by_vpc = self._group_by_vpc(elasticache_replication_groups)
+        msk_clusters_by_vpc = self._group_by_vpc(msk_clusters)
+        
+        route53_zones_by_vpc = defaultdict(list)
+        for zone in route53_zones:
+            for associated_vpc_id in dict.fromkeys(zone.vpc_associations):
+                route53_zones_by_vpc[associated_vpc_id].append(zone)
+        
+        # Attach each VPC-configured Lambda function to the VPCs of its subnets
+        subnet_to_vpc = {subnet.resource_id: subnet.vpc_id for subnet in subnets}
+        lambdas_by_vpc = defaultdict(list)
+        for func in lambda_functions:
+            if not func.vpc_config:
+                continue
+            for func_vpc_id in dict.fromkeys(subnet_to_vpc.get(subnet_id) for subnet_id in func.subnet_ids):
+                if func_vpc_id:
+                    lambdas_by_vpc[func_vpc_id].append(func)
+        
         for vpc in vpcs:
-            vpc_subnets = [subnet for subnet in subnets if subnet.vpc_id == vpc.resource_id]
-            vpc_route_tables = [rt for rt in route_tables if rt.vpc_id == vpc.resource_id]
-            vpc_gateways = [igw for igw in internet_gateways if igw.vpc_id == vpc.resource_id]
-            vpc_nat_gateways = [nat for nat in nat_gateways if nat.vpc_id == vpc.resource_id]
-            vpc_network_acls = [acl for acl in network_acls if acl.vpc_id == vpc.resource_id]
-            vpc_security_groups = [sg for sg in security_groups if sg.vpc_id == vpc.resource_id]
-            vpc_instances = [instance for instance in ec2_instances if instance.vpc_id == vpc.resource_id]
-            
-            vpc_lambda_functions = []
-            for func in lambda_functions:
-                if func.vpc_config and any(subnet.vpc_id == vpc.resource_id for subnet in vpc_subnets 
-                                         if subnet.resource_id in func.subnet_ids):
-                    vpc_lambda_functions.append(func)
-            
-            vpc_route53_zones = [zone for zone in route53_zones if vpc.resource_id in zone.vpc_associations]
-            vpc_rds_instances = [rds for rds in rds_instances if rds.vpc_id == vpc.resource_id]
-            vpc_elasticache_clusters = [cache for cache in elasticache_clusters if cache.vpc_id == vpc.resource_id]
-            vpc_elasticache_replication_groups = [rg for rg in elasticache_replication_groups if rg.vpc_id == vpc.resource_id]
-            vpc_msk_clusters = [msk for msk in msk_clusters if msk.vpc_id == vpc.resource_id]
-            
+            vpc_id = vpc.resource_id
             topology = NetworkTopology(
                 vpc=vpc,
-                subnets=vpc_subnets,
-                route_tables=vpc_route_tables,
-                internet_gateways=vpc_gateways,
-                nat_gateways=vpc_nat_gateways,
-                network_acls=vpc_network_acls,
-                security_groups=vpc_security_groups,
-                ec2_instances=vpc_instances,
-                lambda_functions=vpc_lambda_functions,
-                route53_zones=vpc_route53_zones,
+                subnets=subnets_by_vpc.get(vpc_id, []),
+                route_tables=route_tables_by_vpc.get(vpc_id, []),
+                internet_gateways=gateways_by_vpc.get(vpc_id, []),
+                nat_gateways=nat_gateways_by_vpc.get(vpc_id, []),
+                network_acls=network_acls_by_vpc.get(vpc_id, []),
+                security_groups=security_groups_by_vpc.get(vpc_id, []),
+                ec2_instances=instances_by_vpc.get(vpc_id, []),
+                lambda_functions=lambdas_by_vpc.get(vpc_id, []),
+                route53_zones=route53_zones_by_vpc.get(vpc_id, []),
                 api_gateways=api_gateways,
-                rds_instances=vpc_rds_instances,
-                elasticache_clusters=vpc_elasticache_clusters,
-                elasticache_replication_groups=vpc_elasticache_replication_groups,
-                msk_clusters=vpc_msk_clusters
+                rds_instances=rds_instances_by_vpc.get(vpc_id, []),
+                elasticache_clusters=elasticache_clusters_by_vpc.get(vpc_id, []),
+                elasticache_replication_groups=elasticache_replication_groups_by_vpc.get(vpc_id, []),
+                msk_clusters=msk_clusters_by_vpc.get(vpc_id, [])
             )
             topologies.append(topology)
         
         return topologies
     
+    @staticmethod
+    def _group_by_vpc(resources: List[T]) -> Dict[Optional[str], List[T]]:
+        """Group resources by their vpc_id attribute, keeping discovery order."""
+        grouped: Dict[Optional[str], List[T]] = defaultdict(list)
+        for resource in resources:
+            grouped[resource.vpc_id].append(resource)
+        return grouped
+    
     def create_account_topology(
         self,
         region: str,
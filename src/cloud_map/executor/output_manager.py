@@ -5,7 +5,7 @@ import json
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TextIO
 import boto3
 
 
@@ -165,9 +165,6 @@ class OutputManager:
         
         return files
     
-    def save_terminal_output(self, content: str, session_dir: Path, region: str) -> Path:
-        """Save terminal output to text file."""
-        output_file = session_dir / f"{region}_infrastructure.txt"
-        with open(output_file, 'w') as f:
-            f.write(content)
-        return output_file
\ No newline at end of file
+    def open_terminal_output(self, session_dir: Path, region: str) -> TextIO:
+        """Open the terminal output text file for incremental writes."""
+        return open(session_dir / f"{region}_infrastructure.txt", 'w')
\ No newline at end of file
@@ -1,85 +1,85 @@
 """Resource models for cloud infrastructure components."""
 
 from abc import ABC
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional
 
 
-@dataclass
+class Route(NamedTuple):
+    """Single route entry of a route table."""
+    
+    destination: str
+    gateway_id: str
+    state: str
+
+
+@dataclass(slots=True)
 class BaseResource(ABC):
     """Base class for all AWS resources."""
     
     resource_id: str
     resource_type: str
     region: str
-    tags: Dict[str, str]
+    tags: Mapping[str, str]
+    # resource_id with dashes replaced, usable as a diagram identifier
+    safe_id: str = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
+        self.safe_id = self.resource_id.replace('-', '_')
         if hasattr(self, 'name') and not self.name and 'Name' in self.tags:
             self.name = self.tags['Name']
 
 
-@dataclass
+@dataclass(slots=True)
 class VPC(BaseResource):
     """VPC resource model."""
     
+    resource_type: str = field(default='vpc', init=False)
     cidr_block: str
     state: str
     is_default: bool
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "vpc"
 
 
-@dataclass
+@dataclass(slots=True)
 class Subnet(BaseResource):
     """Subnet resource model."""
     
+    resource_type: str = field(default='subnet', init=False)
     vpc_id: str
     cidr_block: str
     availability_zone: str
     state: str
     map_public_ip_on_launch: bool
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "subnet"
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteTable(BaseResource):
     """Route table resource model."""
     
+    resource_type: str = field(default='route_table', init=False)
     vpc_id: str
-    routes: List[Dict[str, str]]
+    routes: List[Route]
     subnet_associations: List[str]
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "route_table"
 
 
-@dataclass
+@dataclass(slots=True)
 class InternetGateway(BaseResource):
     """Internet gateway resource model."""
     
+    resource_type: str = field(default='internet_gateway', init=False)
     vpc_id: Optional[str]
     state: str
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "internet_gateway"
 
 
-@dataclass
+@dataclass(slots=True)
 class EC2Instance(BaseResource):
     """EC2 instance resource model."""
     
+    resource_type: str = field(default='ec2_instance', init=False)
     instance_type: str
     state: str
     vpc_id: str
@@ -88,16 +88,13 @@ class EC2Instance(BaseResource):
     security_groups: List[str]
     public_ip: Optional[str] = None
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "ec2_instance"
 
 
-@dataclass
+@dataclass(slots=True)
 class LambdaFunction(BaseResource):
     """Lambda function resource model."""
     
+    resource_type: str = field(default='lambda_function', init=False)
     function_name: str
     runtime: str
     state: str
@@ -105,48 +102,45 @@ class LambdaFunction(BaseResource):
     security_group_ids: List[str]
     vpc_config: Optional[Dict[str, str]] = None
     name: Optional[str] = None
+    subnet_id_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "lambda_function"
+        # Zero-argument super() is unavailable in slotted dataclasses
+        BaseResource.__post_init__(self)
+        self.subnet_id_set = frozenset(self.subnet_ids)
 
 
-@dataclass
+@dataclass(slots=True)
 class Route53HostedZone(BaseResource):
     """Route53 hosted zone resource model."""
     
+    resource_type: str = field(default='route53_hosted_zone', init=False)
     zone_name: str
     zone_id: str
     private_zone: bool
     record_count: int
     vpc_associations: List[str]
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "route53_hosted_zone"
 
 
-@dataclass
+@dataclass(slots=True)
 class APIGateway(BaseResource):
     """API Gateway resource model."""
     
+    resource_type: str = field(default='api_gateway', init=False)
     api_name: str
     api_type: str
     protocol_type: str
     endpoint_type: str
     vpc_links: List[str]
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "api_gateway"
 
 
-@dataclass
+@dataclass(slots=True)
 class NATGateway(BaseResource):
     """NAT Gateway resource model."""
     
+    resource_type: str = field(default='nat_gateway', init=False)
     vpc_id: str
     subnet_id: str
     state: str
@@ -154,47 +148,38 @@ class NATGateway(BaseResource):
     connectivity_type: str
     allocation_id: Optional[str] = None
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "nat_gateway"
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkACL(BaseResource):
     """Network ACL resource model."""
     
+    resource_type: str = field(default='network_acl', init=False)
     vpc_id: str
     is_default: bool
     subnet_associations: List[str]
     entries: List[Dict[str, str]]
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "network_acl"
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityGroup(BaseResource):
     """Security Group resource model."""
     
+    resource_type: str = field(default='security_group', init=False)
     vpc_id: str
     group_name: str
     description: str
     inbound_rules: List[Dict[str, str]]
     outbound_rules: List[Dict[str, str]]
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "security_group"
 
 
-@dataclass
+@dataclass(slots=True)
 class RDSInstance(BaseResource):
     """RDS database instance resource model."""
     
+    resource_type: str = field(default='rds_instance', init=False)
     db_instance_identifier: str
     db_instance_class: str
     engine: str
@@ -212,23 +197,16 @@ class RDSInstance(BaseResource):
     storage_encrypted: bool
     db_instance_status: str
     read_replica_source: Optional[str] = None
-    read_replica_db_instance_identifiers: List[str] = None
-    rds_nodes: List['RDSNode'] = None
+    read_replica_db_instance_identifiers: List[str] = field(default_factory=list)
+    rds_nodes: List['RDSNode'] = field(default_factory=list)
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "rds_instance"
-        if self.read_replica_db_instance_identifiers is None:
-            self.read_replica_db_instance_identifiers = []
-        if self.rds_nodes is None:
-            self.rds_nodes = []
 
 
-@dataclass
+@dataclass(slots=True)
 class ElastiCacheCluster(BaseResource):
     """ElastiCache cluster resource model."""
     
+    resource_type: str = field(default='elasticache_cluster', init=False)
     cache_cluster_id: str
     cache_node_type: str
     engine: str
@@ -242,21 +220,16 @@ class ElastiCacheCluster(BaseResource):
     port: int
     parameter_group_name: str
     cache_nodes: List[Dict[str, str]]
-    elasticache_nodes: List['ElastiCacheNode'] = None
+    elasticache_nodes: List['ElastiCacheNode'] = field(default_factory=list)
     replication_group_id: Optional[str] = None
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "elasticache_cluster"
-        if self.elasticache_nodes is None:
-            self.elasticache_nodes = []
 
 
-@dataclass
+@dataclass(slots=True)
 class ElastiCacheReplicationGroup(BaseResource):
     """ElastiCache replication group resource model."""
     
+    resource_type: str = field(default='elasticache_replication_group', init=False)
     replication_group_id: str
     description: str
     status: str
@@ -272,20 +245,15 @@ class ElastiCacheReplicationGroup(BaseResource):
     port: int
     multi_az: str
     automatic_failover: str
-    elasticache_nodes: List['ElastiCacheNode'] = None
+    elasticache_nodes: List['ElastiCacheNode'] = field(default_factory=list)
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "elasticache_replication_group"
-        if self.elasticache_nodes is None:
-            self.elasticache_nodes = []
 
 
-@dataclass
+@dataclass(slots=True)
 class RDSNode(BaseResource):
     """Individual RDS node (for Multi-AZ or read replicas)."""
     
+    resource_type: str = field(default='rds_node', init=False)
     db_instance_identifier: str
     parent_cluster_id: str
     node_type: str  # primary, replica, standby
@@ -295,16 +263,13 @@ class RDSNode(BaseResource):
     port: int
     status: str
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "rds_node"
 
 
-@dataclass
+@dataclass(slots=True)
 class ElastiCacheNode(BaseResource):
     """Individual ElastiCache node."""
     
+    resource_type: str = field(default='elasticache_node', init=False)
     cache_node_id: str
     cache_cluster_id: str
     cache_node_type: str
@@ -315,16 +280,13 @@ class ElastiCacheNode(BaseResource):
     port: int
     parameter_group_status: str
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "elasticache_node"
 
 
-@dataclass
+@dataclass(slots=True)
 class MSKBrokerNode(BaseResource):
     """Individual MSK Kafka broker node."""
     
+    resource_type: str = field(default='msk_broker_node', init=False)
     broker_id: str
     cluster_arn: str
     instance_type: str
@@ -335,16 +297,13 @@ class MSKBrokerNode(BaseResource):
     client_vpc_ip_address: str
     status: str
     name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "msk_broker_node"
 
 
-@dataclass
+@dataclass(slots=True)
 class MSKCluster(BaseResource):
     """Amazon MSK (Kafka) cluster resource model."""
     
+    resource_type: str = field(default='msk_cluster', init=False)
     cluster_name: str
     cluster_arn: str
     kafka_version: str
@@ -360,13 +319,7 @@ class MSKCluster(BaseResource):
     encryption_info: Dict[str, str]
     client_authentication: Dict[str, str]
     logging_info: Dict[str, str]
-    broker_nodes: List[MSKBrokerNode] = None
+    broker_nodes: List[MSKBrokerNode] = field(default_factory=list)
     zookeeper_connect_string: Optional[str] = None
     bootstrap_broker_string: Optional[str] = None
-    name: Optional[str] = None
-    
-    def __post_init__(self):
-        super().__post_init__()
-        self.resource_type = "msk_cluster"
-        if self.broker_nodes is None:
-            self.broker_nodes = []
\ No newline at end of file
+    name: Optional[str] = None
\ No newline at end of file